@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+from pdf2image import convert_from_path
+from PIL import Image
+from src.processor.pdf_loader import PDFLoader
+from src.processor.image_preprocessor import ImagePreprocessor
+
+# Usage: python benchmark_ocr.py scan1.pdf photo1.jpg ...
+# Compares OCR speed and text yield across preprocessing/Tesseract settings.
+
+CONFIGS = [
+    ("baseline (no preprocessing)", dict(ocr_dpi=200, ocr_psm=3, preprocessor=False)),
+    ("grayscale (+ photo downscale)", dict(ocr_dpi=200, ocr_psm=3, preprocessor=ImagePreprocessor(binarize=False, deskew=False))),
+    ("full preprocessing", dict(ocr_dpi=200, ocr_psm=3)),
+    ("full preprocessing, psm 6", dict(ocr_dpi=200, ocr_psm=6)),
+    ("full preprocessing, 150 dpi", dict(ocr_dpi=150, ocr_psm=3)),
+    ("full preprocessing, 300 dpi", dict(ocr_dpi=300, ocr_psm=3)),
+]
+
+def load_pages(file_path, dpi):
+    """
+    Returns (images, is_photo): rendered PDF pages, or a single uploaded photo.
+    """
+    if os.path.splitext(file_path)[1].lower() == '.pdf':
+        return convert_from_path(file_path, dpi=dpi, grayscale=True), False
+    return [Image.open(file_path)], True
+
+def run(files):
+    print(f"{'Config':<32}{'Pages':>7}{'s/page':>10}{'chars/page':>12}{'words/page':>12}")
+    for name, kwargs in CONFIGS:
+        loader = PDFLoader(**kwargs)
+        pages = 0
+        elapsed = 0.0
+        chars = 0
+        words = 0
+        for file_path in files:
+            # Rendering cost depends on DPI, so it counts towards the page time
+            start = time.perf_counter()
+            images, is_photo = load_pages(file_path, loader.ocr_dpi)
+            elapsed += time.perf_counter() - start
+            for image in images:
+                start = time.perf_counter()
+                text = loader._ocr_image(image, is_photo=is_photo)
+                elapsed += time.perf_counter() - start
+                pages += 1
+                chars += len(text.strip())
+                words += len(text.split())
+
+        if pages == 0:
+            continue
+        print(f"{name:<32}{pages:>7}{elapsed / pages:>10.2f}{chars / pages:>12.0f}{words / pages:>12.0f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark_ocr.py <file.pdf|image> [...]")
+        sys.exit(1)
+    run(sys.argv[1:])
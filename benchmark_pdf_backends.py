@@ -0,0 +1,64 @@
+import sys
+import io
+import re
+import time
+from src.processor.pdf_backends import BACKENDS, available_backends, get_backend
+from src.processor.question_extractor import QuestionExtractor
+
+# Usage: python benchmark_pdf_backends.py paper1.pdf paper2.pdf ...
+# Compares speed and text quality of every installed PDF text backend on the same papers.
+# Quality is measured by how much usable text comes out: words, the share of
+# words that look like real words, and how many questions the extractor finds.
+
+def text_quality(text, extractor):
+    words = text.split()
+    real_words = [w for w in words if re.fullmatch(r"[A-Za-z][a-z]+[.,;:?]?", w)]
+    return {
+        'words': len(words),
+        'real_ratio': len(real_words) / len(words) if words else 0.0,
+        'questions': len(extractor.extract_questions(text)),
+    }
+
+def run(files, repeats=3):
+    extractor = QuestionExtractor()
+    papers = []
+    for file_path in files:
+        with open(file_path, 'rb') as f:
+            papers.append(f.read())
+
+    print(f"Installed backends: {', '.join(available_backends())} (auto-selected: {get_backend().name})")
+    print(f"{'Backend':<10}{'Pages':>7}{'ms/page':>10}{'Words':>9}{'Real %':>8}{'Questions':>11}")
+    for backend_cls in BACKENDS:
+        if not backend_cls.is_available():
+            print(f"{backend_cls.name:<10}  (not installed)")
+            continue
+
+        backend = get_backend(backend_cls.name)
+        pages = 0
+        best = float('inf')
+        quality = {'words': 0, 'real_ratio': 0.0, 'questions': 0}
+
+        # Best of several runs to smooth out caching noise
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results = []
+            for data in papers:
+                results.append(backend.extract_pages(io.BytesIO(data)))
+            best = min(best, time.perf_counter() - start)
+
+        for page_texts in results:
+            pages += len(page_texts)
+            q = text_quality("\n".join(page_texts), extractor)
+            quality['words'] += q['words']
+            quality['real_ratio'] += q['real_ratio'] * q['words']
+            quality['questions'] += q['questions']
+
+        real_pct = 100 * quality['real_ratio'] / quality['words'] if quality['words'] else 0.0
+        ms_per_page = 1000 * best / pages if pages else 0.0
+        print(f"{backend.name:<10}{pages:>7}{ms_per_page:>10.1f}{quality['words']:>9}{real_pct:>8.1f}{quality['questions']:>11}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmark_pdf_backends.py <paper.pdf> [...]")
+        sys.exit(1)
+    run(sys.argv[1:])
@@ -1,24 +1,102 @@
 import streamlit as st
 import os
-import tempfile
-from src.processor.pdf_loader import PDFLoader
-from src.processor.syllabus_parser import SyllabusParser
-from src.processor.question_extractor import QuestionExtractor
+import math
 from src.analyzer.semantic_modeler import SemanticModeler
-from src.predictor.predictor import Predictor
 from src.collector.web_scraper import WebScraper
+from src.collector.material_prefetcher import StudyMaterialCache
 
 from src.generator.answer_generator import AnswerGenerator
+from src.generator.answer_cache import AnswerCache
+from src.pipeline.analysis_jobs import JobManager, copy_upload
 
-def save_uploaded_file(uploaded_file):
-    try:
-        suffix = os.path.splitext(uploaded_file.name)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            return tmp_file.name
-    except Exception as e:
-        st.error(f"Error saving file: {e}")
-        return None
+TOPICS_PER_PAGE = 20
+
+@st.cache_resource
+def get_answer_cache():
+    # One cache per server, shared by all sessions; reuses the SemanticModeler encoder
+    return AnswerCache(SemanticModeler().model, threshold=0.9)
+
+@st.cache_resource
+def get_material_cache():
+    # Shared across sessions so each topic is searched once per TTL, not once per click
+    return StudyMaterialCache(WebScraper(), ttl=24 * 3600)
+
+@st.cache_resource
+def get_job_manager():
+    # Caps concurrent heavy (OCR/embedding) analyses on this server; others queue
+    return JobManager(max_workers=int(os.environ.get("STUDY_SMART_MAX_JOBS", "2")))
+
+@st.fragment(run_every=1)
+def render_job_progress(job_id):
+    """
+    Polls a background analysis and shows its progress; reruns the app when it ends.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.state in ("done", "failed"):
+        st.rerun()
+
+    st.progress(job.progress, text=job.message)
+    with st.expander("Progress details"):
+        for line in job.log:
+            st.markdown(f"- {line}")
+
+@st.cache_resource
+def get_answer_generator(api_key):
+    # Model discovery (client.models.list) is a network call; do it once per key.
+    # Safe to share: each generator holds its own client bound to its key.
+    return AnswerGenerator(api_key, cache=get_answer_cache())
+
+@st.fragment
+def render_topic_card(item, subject_name, api_key):
+    """
+    Renders one topic of the study plan. Buttons inside only rerun this card,
+    not the whole dashboard.
+    """
+    priority_color = "red" if item['priority'] == "High" else "orange" if item['priority'] == "Medium" else "green"
+    
+    with st.expander(f"**{item['topic']}**  [{item['priority']}] - {item['weightage']}% Weightage"):
+        col_a, col_b = st.columns([3, 1])
+        
+        with col_a:
+            st.markdown(f"**Frequency:** Appeared {item['count']} times")
+            st.markdown(f"**Priority:** :{priority_color}[{item['priority']}]")
+            st.markdown("---")
+            st.markdown("**Example Questions:**")
+            for idx, q in enumerate(item['example_questions']):
+                st.markdown(f"- {q}")
+                if api_key:
+                    # Create a unique key for this question
+                    q_key = f"ans_{item['topic']}_{idx}"
+                    
+                    # Initialize session state for answers if needed
+                    if 'generated_answers' not in st.session_state:
+                        st.session_state['generated_answers'] = {}
+                    
+                    # Check if we already have an answer
+                    existing_ans = st.session_state['generated_answers'].get(q_key)
+                    
+                    if existing_ans:
+                        st.markdown("### Model Answer")
+                        st.info(existing_ans)
+                    else:
+                        if st.button(f"✨ Generate Answer", key=f"btn_{q_key}"):
+                            with st.spinner("Writing answer..."):
+                                ans = get_answer_generator(api_key).generate_answer(q, subject_name)
+                                st.session_state['generated_answers'][q_key] = ans
+                                st.rerun(scope="fragment")
+                
+        with col_b:
+            if item['priority'] == "High":
+                if st.button(f"📚 Study Materials", key=f"btn_{item['topic']}"):
+                    with st.spinner("Fetching resources..."):
+                        links = get_material_cache().get(item['topic'])
+                        if links is None:
+                            st.warning("Search is unavailable right now. Please try again shortly.")
+                        elif links:
+                            for title, url in links:
+                                st.markdown(f"[{title}]({url})")
+                        else:
+                            st.info("No specific links found.")
 
 def main():
     st.set_page_config(page_title="Question Paper Predictor", layout="wide")
@@ -40,9 +118,13 @@ def main():
         
         with st.expander("Advanced Settings"):
             tesseract_path = st.text_input("Tesseract Path (Optional)", value="", placeholder="C:\\Program Files\\Tesseract-OCR\\tesseract.exe")
+            ocr_lang = st.text_input("OCR Language(s)", value="eng", help="Tesseract language codes, e.g. 'eng' or 'eng+hin'")
+            ocr_psm = st.selectbox("OCR Page Layout", [3, 4, 6], format_func=lambda m: {3: "Auto (3)", 4: "Columns (4)", 6: "Single Block (6)"}[m])
+            ocr_dpi = st.select_slider("Scan Resolution (DPI)", options=[150, 200, 300], value=200)
             
         if st.button("🔄 Reset App"):
             st.session_state.clear()
+            st.query_params.clear()
             st.rerun()
         
     col1, col2 = st.columns(2)
@@ -66,8 +148,8 @@ def main():
         st.session_state['study_plan'] = None
     if 'processed_data' not in st.session_state:
         st.session_state['processed_data'] = None
-    if 'paper_paths' not in st.session_state:
-        st.session_state['paper_paths'] = []
+    if 'paper_names' not in st.session_state:
+        st.session_state['paper_names'] = []
 
     if st.button("Analyze & Predict", type="primary"):
         if not syllabus_file:
@@ -78,82 +160,64 @@ def main():
             st.error("Please upload at least one question paper.")
             return
 
-        with st.spinner("Initializing modules..."):
-            loader = PDFLoader(tesseract_cmd=tesseract_path if tesseract_path else None)
-            syllabus_parser = SyllabusParser()
-            extractor = QuestionExtractor()
-            modeler = SemanticModeler(n_topics=5)
-            predictor = Predictor()
-            scraper = WebScraper()
-
-        # 1. Process Syllabus
-        with st.spinner("Processing Syllabus..."):
-            syl_path = save_uploaded_file(syllabus_file)
-            syllabus_topics = syllabus_parser.parse_syllabus(syl_path)
-            st.success(f"Extracted {len(syllabus_topics)} topics from syllabus.")
-            with st.expander("View Syllabus Topics"):
-                st.write(syllabus_topics)
-
-        # 2. Acquire Papers
-        paper_paths = []
-        if input_method == "Upload Files":
-            for p_file in paper_files:
-                p_path = save_uploaded_file(p_file)
-                if p_path:
-                    paper_paths.append(p_path)
-        else:
-            with st.spinner("Searching and downloading papers..."):
-                paper_paths = scraper.find_papers(subject_name, university_name)
-                if not paper_paths:
-                    st.error("No papers found online. Please upload manually.")
-                    return
-                st.success(f"Downloaded {len(paper_paths)} papers.")
-        
-        st.session_state['paper_paths'] = paper_paths
-
-        # 3. Process Papers
-        processed_data = []
-        
-        progress_bar = st.progress(0)
-        for i, p_path in enumerate(paper_paths):
-            with st.spinner(f"Processing paper {i+1}..."):
-                raw_text = loader.extract_text(p_path)
-                
-                if raw_text:
-                    questions = extractor.extract_questions(raw_text)
-                    valid_data = modeler.filter_by_syllabus(questions, syllabus_topics)
-                    
-                    processed_data.append({
-                        'filename': os.path.basename(p_path),
-                        'questions': valid_data
-                    })
-            
-            progress_bar.progress((i + 1) / len(paper_paths))
+        options = {
+            'subject_name': subject_name,
+            'university_name': university_name,
+            'tesseract_path': tesseract_path,
+            'ocr_lang': ocr_lang.strip() or 'eng',
+            'ocr_psm': ocr_psm,
+            'ocr_dpi': ocr_dpi,
+        }
+        # Uploads are copied out of the widget so the worker can read them after this run
+        papers = [copy_upload(f) for f in paper_files] if input_method == "Upload Files" else None
+        job_id = get_job_manager().submit(options, copy_upload(syllabus_file), papers)
 
-        if not processed_data:
-            st.error("No valid data processed.")
-            return
-            
-        st.session_state['processed_data'] = processed_data
+        # The job id in the URL lets a refreshed or reconnecting browser find the job
+        st.session_state['job_id'] = job_id
+        st.query_params['job'] = job_id
+        st.session_state['study_plan'] = None
+        st.session_state['processed_data'] = None
 
-        # 4. Generate Study Plan
-        with st.spinner("Generating Study Strategy..."):
-            study_plan = predictor.generate_study_plan(processed_data)
-            st.session_state['study_plan'] = study_plan
+    # --- Pick up a running or finished background job ---
+    job_id = st.session_state.get('job_id') or st.query_params.get('job')
+    if job_id and st.session_state['study_plan'] is None:
+        job = get_job_manager().get(job_id)
+        if job is None:
+            st.session_state.pop('job_id', None)
+            st.query_params.clear()
+        elif job.state in ("queued", "running"):
+            st.session_state['job_id'] = job_id
+            render_job_progress(job_id)
+        elif job.state == "failed":
+            st.error(job.error)
+        else:
+            st.session_state['job_id'] = job_id
+            st.success(f"Extracted {len(job.syllabus_topics)} topics from syllabus.")
+            with st.expander("View Syllabus Topics"):
+                st.write(job.syllabus_topics)
+            st.session_state['paper_names'] = job.paper_names
+            # The sidebar resets after a refresh; keep the subject the plan was built for
+            st.session_state['plan_subject'] = job.options.get('subject_name') or subject_name
+            st.session_state['processed_data'] = get_job_manager().load_questions(job_id)
+            st.session_state['study_plan'] = job.study_plan
+            # A new plan may have fewer pages than the one being viewed
+            st.session_state.pop('topic_page', None)
 
     # --- Display Dashboard if data exists ---
     if st.session_state['study_plan']:
         study_plan = st.session_state['study_plan']
-        paper_paths = st.session_state['paper_paths']
+        paper_names = st.session_state['paper_names']
+        plan_subject = st.session_state.get('plan_subject', subject_name)
         
-        # Re-initialize modules for interaction if needed (like scraper/answer_gen)
-        # We need these for the buttons to work
-        scraper = WebScraper()
-        answer_gen = AnswerGenerator(api_key) if api_key else None
+        material_cache = get_material_cache()
+
+        # Resolve study material for High priority topics in the background;
+        # already cached or in-flight topics are skipped, so this is cheap on reruns
+        material_cache.prefetch([t['topic'] for t in study_plan if t['priority'] == 'High'])
             
         st.divider()
         st.header("📈 Smart Study Plan")
-        st.markdown(f"**Subject:** {subject_name} | **Based on:** {len(paper_paths)} papers")
+        st.markdown(f"**Subject:** {plan_subject} | **Based on:** {len(paper_names)} papers")
         
         # Dashboard Metrics
         col1, col2, col3 = st.columns(3)
@@ -163,53 +227,26 @@ def main():
         col1.metric("High Priority Topics", high_pri)
         col2.metric("Medium Priority Topics", med_pri)
         col3.metric("Total Topics Found", len(study_plan))
+
+        # The cache loads its own encoder, so only touch it when answers are enabled
+        cache_stats = get_answer_cache().stats() if api_key else None
+        if cache_stats and cache_stats['hits'] + cache_stats['misses']:
+            st.caption(f"Answer cache: {cache_stats['hit_rate']:.0%} hit rate ({cache_stats['hits']} hits, {cache_stats['entries']} cached answers)")
         
         st.subheader("Topic Priority List")
+
+        # Only one page of topic cards is built per run, so large plans stay responsive
+        total_pages = math.ceil(len(study_plan) / TOPICS_PER_PAGE)
+        page = 1
+        if total_pages > 1:
+            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="topic_page")
+        start = (page - 1) * TOPICS_PER_PAGE
+        page_items = study_plan[start:start + TOPICS_PER_PAGE]
+        if total_pages > 1:
+            st.caption(f"Showing topics {start + 1}-{start + len(page_items)} of {len(study_plan)}")
         
-        for item in study_plan:
-            priority_color = "red" if item['priority'] == "High" else "orange" if item['priority'] == "Medium" else "green"
-            
-            with st.expander(f"**{item['topic']}**  [{item['priority']}] - {item['weightage']}% Weightage"):
-                col_a, col_b = st.columns([3, 1])
-                
-                with col_a:
-                    st.markdown(f"**Frequency:** Appeared {item['count']} times")
-                    st.markdown(f"**Priority:** :{priority_color}[{item['priority']}]")
-                    st.markdown("---")
-                    st.markdown("**Example Questions:**")
-                    for idx, q in enumerate(item['example_questions']):
-                        st.markdown(f"- {q}")
-                        if api_key:
-                            # Create a unique key for this question
-                            q_key = f"ans_{item['topic']}_{idx}"
-                            
-                            # Initialize session state for answers if needed
-                            if 'generated_answers' not in st.session_state:
-                                st.session_state['generated_answers'] = {}
-                            
-                            # Check if we already have an answer
-                            existing_ans = st.session_state['generated_answers'].get(q_key)
-                            
-                            if existing_ans:
-                                st.markdown("### Model Answer")
-                                st.info(existing_ans)
-                            else:
-                                if st.button(f"✨ Generate Answer", key=f"btn_{q_key}"):
-                                    with st.spinner("Writing answer..."):
-                                        ans = answer_gen.generate_answer(q, subject_name)
-                                        st.session_state['generated_answers'][q_key] = ans
-                                        st.rerun()
-                        
-                with col_b:
-                    if item['priority'] == "High":
-                        if st.button(f"📚 Study Materials", key=f"btn_{item['topic']}"):
-                            with st.spinner("Fetching resources..."):
-                                links = scraper.find_study_material(item['topic'])
-                                if links:
-                                    for title, url in links:
-                                        st.markdown(f"[{title}]({url})")
-                                else:
-                                    st.info("No specific links found.")
+        for item in page_items:
+            render_topic_card(item, plan_subject, api_key)
 
         st.success("Analysis Complete! Focus on the High Priority topics first.")
 
@@ -0,0 +1,211 @@
+import numpy as np
+
+def _pack_strings(strings):
+    """
+    Packs a list of strings into one UTF-8 blob plus int64 end offsets.
+    """
+    encoded = [s.encode('utf-8') for s in strings]
+    ends = np.cumsum([len(b) for b in encoded], dtype=np.int64) if encoded else np.zeros(0, dtype=np.int64)
+    return b"".join(encoded), ends
+
+def _unpack_strings(blob, ends):
+    strings = []
+    start = 0
+    for end in ends.tolist():
+        strings.append(blob[start:end].decode('utf-8'))
+        start = end
+    return strings
+
+
+class QuestionStore:
+    """
+    Columnar storage for syllabus-matched questions.
+    Replaces the nested list-of-dicts processed_data: one row per question with
+    an interned topic id, float32 similarity, paper id and optional embedding row.
+    Question text lives in a single UTF-8 blob addressed by offsets.
+    """
+    def __init__(self):
+        self.topics = []         # topic id -> topic name
+        self._topic_index = {}   # topic name -> topic id
+        self.paper_names = []    # paper id -> file name
+
+        # Columns are appended per paper and concatenated lazily
+        self._chunks = {'topic_ids': [], 'similarity': [], 'paper_ids': [], 'embedding_refs': [], 'text_ends': []}
+        self._text_chunks = []
+        self._text_size = 0
+        self._embedding_chunks = []
+        self._n_embeddings = 0
+        self._columns = None
+        self._text = b""
+        self._embeddings = None
+
+    def __len__(self):
+        return sum(len(c) for c in self._chunks['topic_ids'])
+
+    def intern_topics(self, topics):
+        """
+        Returns an int32 array of topic ids for the given names, adding new ones.
+        """
+        ids = np.empty(len(topics), dtype=np.int32)
+        for i, topic in enumerate(topics):
+            topic_id = self._topic_index.get(topic)
+            if topic_id is None:
+                topic_id = len(self.topics)
+                self._topic_index[topic] = topic_id
+                self.topics.append(topic)
+            ids[i] = topic_id
+        return ids
+
+    def add_paper(self, paper_name, questions, topic_ids, similarities, embeddings=None):
+        """
+        Appends the matched questions of one paper.
+        topic_ids come from intern_topics(); embeddings is an optional (n x d) array.
+        Returns the paper id.
+        """
+        paper_id = len(self.paper_names)
+        self.paper_names.append(paper_name)
+        n = len(questions)
+
+        blob, ends = _pack_strings(questions)
+        self._text_chunks.append(blob)
+        self._chunks['text_ends'].append(ends + self._text_size)
+        self._text_size += len(blob)
+
+        self._chunks['topic_ids'].append(np.asarray(topic_ids, dtype=np.int32))
+        self._chunks['similarity'].append(np.asarray(similarities, dtype=np.float32))
+        self._chunks['paper_ids'].append(np.full(n, paper_id, dtype=np.int32))
+
+        if embeddings is not None and n:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            self._embedding_chunks.append(embeddings)
+            refs = np.arange(self._n_embeddings, self._n_embeddings + n, dtype=np.int64)
+            self._n_embeddings += n
+        else:
+            refs = np.full(n, -1, dtype=np.int64)
+        self._chunks['embedding_refs'].append(refs)
+
+        self._columns = None
+        return paper_id
+
+    def _consolidate(self):
+        if self._columns is not None:
+            return self._columns
+
+        self._columns = {}
+        for name, chunks in self._chunks.items():
+            dtype = np.int64 if name in ('embedding_refs', 'text_ends') else np.float32 if name == 'similarity' else np.int32
+            merged = np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+            # Keep a single chunk so the next append doesn't re-concatenate everything
+            self._chunks[name] = [merged]
+            self._columns[name] = merged
+
+        if len(self._text_chunks) > 1:
+            self._text_chunks = [b"".join(self._text_chunks)]
+        self._text = self._text_chunks[0] if self._text_chunks else b""
+
+        if len(self._embedding_chunks) > 1:
+            self._embedding_chunks = [np.vstack(self._embedding_chunks)]
+        self._embeddings = self._embedding_chunks[0] if self._embedding_chunks else None
+        return self._columns
+
+    @property
+    def topic_ids(self):
+        return self._consolidate()['topic_ids']
+
+    @property
+    def similarity(self):
+        return self._consolidate()['similarity']
+
+    @property
+    def paper_ids(self):
+        return self._consolidate()['paper_ids']
+
+    @property
+    def embedding_refs(self):
+        return self._consolidate()['embedding_refs']
+
+    @property
+    def embeddings(self):
+        self._consolidate()
+        return self._embeddings
+
+    def question(self, i):
+        ends = self._consolidate()['text_ends']
+        start = int(ends[i - 1]) if i > 0 else 0
+        return self._text[start:int(ends[i])].decode('utf-8')
+
+    def topic_counts(self):
+        """
+        Number of questions per topic id (vectorized group-by/count).
+        """
+        return np.bincount(self.topic_ids, minlength=len(self.topics))
+
+    def group_by_topic(self):
+        """
+        Returns (order, starts): row indices sorted by topic id, and where each
+        topic's run begins, so rows of topic t are order[starts[t]:starts[t + 1]].
+        """
+        order = np.argsort(self.topic_ids, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(self.topic_counts()))).astype(np.int64)
+        return order, starts
+
+    def to_records(self):
+        """
+        Legacy list-of-papers format: [{'filename', 'questions': [{'question', 'topic', 'similarity'}]}].
+        """
+        cols = self._consolidate()
+        papers = [{'filename': name, 'questions': []} for name in self.paper_names]
+        for i, (topic_id, sim, paper_id) in enumerate(zip(cols['topic_ids'].tolist(), cols['similarity'].tolist(), cols['paper_ids'].tolist())):
+            papers[paper_id]['questions'].append({'question': self.question(i), 'topic': self.topics[topic_id], 'similarity': sim})
+        return papers
+
+    @classmethod
+    def from_records(cls, processed_data):
+        """
+        Builds a store from the legacy list-of-papers format.
+        """
+        store = cls()
+        for i, paper in enumerate(processed_data):
+            items = paper['questions']
+            store.add_paper(
+                paper.get('filename', f"paper_{i+1}"),
+                [item['question'] for item in items],
+                store.intern_topics([item['topic'] for item in items]),
+                [item.get('similarity', 0.0) for item in items],
+            )
+        return store
+
+    def save(self, path):
+        """
+        Writes the store to an uncompressed .npz (fast to write and memory-map friendly).
+        """
+        cols = self._consolidate()
+        topics_blob, topics_ends = _pack_strings(self.topics)
+        papers_blob, papers_ends = _pack_strings(self.paper_names)
+        arrays = dict(cols)
+        arrays['text'] = np.frombuffer(self._text, dtype=np.uint8)
+        arrays['topics_blob'] = np.frombuffer(topics_blob, dtype=np.uint8)
+        arrays['topics_ends'] = topics_ends
+        arrays['papers_blob'] = np.frombuffer(papers_blob, dtype=np.uint8)
+        arrays['papers_ends'] = papers_ends
+        if self._embeddings is not None:
+            arrays['embeddings'] = self._embeddings
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with np.load(path) as data:
+            store.topics = _unpack_strings(data['topics_blob'].tobytes(), data['topics_ends'])
+            store._topic_index = {t: i for i, t in enumerate(store.topics)}
+            store.paper_names = _unpack_strings(data['papers_blob'].tobytes(), data['papers_ends'])
+            for name in store._chunks:
+                store._chunks[name] = [data[name]]
+            text = data['text'].tobytes()
+            store._text_chunks = [text] if text else []
+            store._text_size = len(text)
+            if 'embeddings' in data.files:
+                store._embedding_chunks = [data['embeddings']]
+                store._n_embeddings = len(data['embeddings'])
+        return store
@@ -10,6 +10,8 @@ class SemanticModeler:
         self.model = SentenceTransformer(model_name)
         self.kmeans = KMeans(n_clusters=n_topics, random_state=42, n_init=10)
         self.cluster_centers_ = None
+        self._syllabus_key = None
+        self._syllabus_embeddings = None
 
     def fit_transform(self, questions):
         """
@@ -43,18 +45,21 @@ class SemanticModeler:
             
         return topic_distributions
 
-    def filter_by_syllabus(self, questions, syllabus_topics, threshold=0.25):
+    def _encode_syllabus(self, syllabus_topics):
+        # The syllabus is the same for every paper, so encode it once
+        key = tuple(syllabus_topics)
+        if self._syllabus_key != key:
+            self._syllabus_embeddings = self.model.encode(syllabus_topics)
+            self._syllabus_key = key
+        return self._syllabus_embeddings
+
+    def _match_syllabus(self, questions, syllabus_topics, threshold):
         """
-        Filters questions using semantic similarity to syllabus topics.
-        Returns a list of dicts: {'question': q, 'topic': t, 'similarity': s}
+        Returns (kept, topic_indices, sims, q_embeddings) for questions whose best
+        syllabus similarity clears the threshold. kept indexes into questions.
         """
-        if not syllabus_topics:
-            # If no syllabus, return questions with unknown topic
-            return [{'question': q, 'topic': 'Unknown', 'similarity': 0.0} for q in questions]
-            
-        # Encode everything
         q_embeddings = self.model.encode(questions)
-        s_embeddings = self.model.encode(syllabus_topics)
+        s_embeddings = self._encode_syllabus(syllabus_topics)
         
         # Calculate similarity matrix (Questions x Syllabus)
         similarities = cosine_similarity(q_embeddings, s_embeddings)
@@ -63,14 +68,54 @@ class SemanticModeler:
         max_sims = similarities.max(axis=1)
         topic_indices = similarities.argmax(axis=1)
         
+        kept = np.flatnonzero(max_sims >= threshold)
+        print(f"Semantic Filter: Kept {len(kept)}/{len(questions)} questions (Threshold: {threshold})")
+        return kept, topic_indices[kept], max_sims[kept], q_embeddings[kept]
+
+    def filter_by_syllabus(self, questions, syllabus_topics, threshold=0.25):
+        """
+        Filters questions using semantic similarity to syllabus topics.
+        Returns a list of dicts: {'question': q, 'topic': t, 'similarity': s}
+        """
+        if not syllabus_topics:
+            # If no syllabus, return questions with unknown topic
+            return [{'question': q, 'topic': 'Unknown', 'similarity': 0.0} for q in questions]
+        if not questions:
+            return []
+            
+        kept, topic_indices, sims, _ = self._match_syllabus(questions, syllabus_topics, threshold)
+        
         valid_data = []
-        for i, sim in enumerate(max_sims):
-            if sim >= threshold:
-                valid_data.append({
-                    'question': questions[i],
-                    'topic': syllabus_topics[topic_indices[i]],
-                    'similarity': float(sim)
-                })
-                
-        print(f"Semantic Filter: Kept {len(valid_data)}/{len(questions)} questions (Threshold: {threshold})")
+        for i, t, sim in zip(kept, topic_indices, sims):
+            valid_data.append({
+                'question': questions[i],
+                'topic': syllabus_topics[t],
+                'similarity': float(sim)
+            })
         return valid_data
+
+    def filter_into_store(self, store, paper_name, questions, syllabus_topics, threshold=0.25, keep_embeddings=False):
+        """
+        Columnar version of filter_by_syllabus: appends the matched questions of
+        one paper to a QuestionStore and returns how many were kept.
+        """
+        if not syllabus_topics or not questions:
+            topic_ids = store.intern_topics(['Unknown'] * len(questions))
+            store.add_paper(paper_name, questions, topic_ids, np.zeros(len(questions), dtype=np.float32))
+            return len(questions)
+
+        kept, topic_indices, sims, q_embeddings = self._match_syllabus(questions, syllabus_topics, threshold)
+        # Register only matched topics, in the order they first appear, so topic ids
+        # (and the Predictor's tie order) follow first appearance like Counter did
+        unique_topics, first_seen = np.unique(topic_indices, return_index=True)
+        unique_topics = unique_topics[np.argsort(first_seen)]
+        syllabus_ids = np.full(len(syllabus_topics), -1, dtype=np.int32)
+        syllabus_ids[unique_topics] = store.intern_topics([syllabus_topics[t] for t in unique_topics])
+        store.add_paper(
+            paper_name,
+            [questions[i] for i in kept],
+            syllabus_ids[topic_indices],
+            sims,
+            embeddings=q_embeddings if keep_embeddings else None,
+        )
+        return len(kept)
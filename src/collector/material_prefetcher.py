@@ -0,0 +1,136 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from .web_scraper import WebScraper
+
+class StudyMaterialCache:
+    """
+    Shared TTL cache for WebScraper.find_study_material results.
+    Topics are normalized before lookup, concurrent requests for the same topic
+    share one in-flight search, and prefetch() resolves topics in the background
+    on a small throttled pool. Interactive get() calls never queue behind it.
+    """
+    def __init__(self, scraper=None, ttl=24 * 3600, empty_ttl=600, failure_backoff=300, max_workers=1):
+        # scraper: anything with find_study_material(topic, raise_errors=True); pass
+        # WebScraper(search_fn=...) to stub out Google in tests
+        self.scraper = scraper if scraper is not None else WebScraper()
+        self.ttl = ttl
+        # Searches that succeed with no links are re-checked sooner; failed
+        # searches (e.g. HTTP 429) are not cached at all
+        self.empty_ttl = empty_ttl
+        # After a failure, prefetch() leaves the topic alone for this long so
+        # reruns don't keep hammering a rate-limited search; clicks still retry
+        self.failure_backoff = failure_backoff
+        self._entries = {}        # key -> (expires_at, links)
+        self._failed_until = {}   # key -> monotonic time before which prefetch skips it
+        self._inflight = {}       # key -> Future
+        self._lock = threading.Lock()
+        # Kept small so prefetching doesn't burst searches and get rate-limited
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="material-prefetch")
+        self.hits = 0
+        self.misses = 0
+        self.searches = 0
+
+    def _key(self, topic):
+        return " ".join(topic.lower().split())
+
+    def _cached(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _fetch(self, key, topic):
+        """
+        Runs one search. Returns the links, or None if the search failed;
+        failures are not cached so the next request retries.
+        """
+        try:
+            links = self.scraper.find_study_material(topic, raise_errors=True)
+        except Exception as e:
+            print(f"Resource search failed for {topic}: {e}")
+            with self._lock:
+                self.searches += 1
+                self._failed_until[key] = time.monotonic() + self.failure_backoff
+                self._inflight.pop(key, None)
+            return None
+        with self._lock:
+            self.searches += 1
+            self._failed_until.pop(key, None)
+            ttl = self.ttl if links else self.empty_ttl
+            self._entries[key] = (time.monotonic() + ttl, links)
+            self._inflight.pop(key, None)
+        return links
+
+    def _prune(self):
+        # Must be called with the lock held
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        for key in [key for key, until in self._failed_until.items() if until <= now]:
+            del self._failed_until[key]
+
+    def prefetch(self, topics):
+        """
+        Queues background searches for any topics not already cached, in flight,
+        or backing off after a recent failure.
+        """
+        with self._lock:
+            self._prune()
+            now = time.monotonic()
+            for topic in topics:
+                key = self._key(topic)
+                if self._cached(key) is not None or key in self._inflight:
+                    continue
+                if self._failed_until.get(key, 0) > now:
+                    continue
+                self._inflight[key] = self._executor.submit(self._fetch, key, topic)
+
+    def get(self, topic, timeout=30):
+        """
+        Returns links for a topic. On a miss the search runs right away on the
+        calling thread rather than queueing behind the prefetch backlog; a search
+        already running for the same topic is shared instead of repeated.
+        Explicit requests ignore the failure backoff that prefetch() respects.
+        Returns None if the search failed or timed out (try again later).
+        """
+        run_here = False
+        with self._lock:
+            key = self._key(topic)
+            links = self._cached(key)
+            if links is not None:
+                self.hits += 1
+                return links
+            self.misses += 1
+
+            future = self._inflight.get(key)
+            if future is not None and future.cancel():
+                # Still waiting in the prefetch queue; don't wait behind it
+                future = None
+            if future is None:
+                future = Future()
+                # Mark it running so other callers wait on it instead of cancelling it
+                future.set_running_or_notify_cancel()
+                self._inflight[key] = future
+                run_here = True
+
+        if run_here:
+            links = self._fetch(key, topic)
+            future.set_result(links)
+            return links
+
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            print(f"Resource search timed out for {topic}: {e}")
+            return None
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'searches': self.searches,
+        }
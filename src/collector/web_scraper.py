@@ -1,17 +1,24 @@
-from googlesearch import search
-import requests
 import os
-import tempfile
+import io
+from urllib.parse import urlparse, unquote
 
 class WebScraper:
-    def __init__(self):
-        pass
+    def __init__(self, max_download_mb=25, search_fn=None):
+        # search_fn(query, num_results=...) -> iterable of URLs; defaults to Google search.
+        # Imported lazily so a stubbed scraper works without the network packages.
+        if search_fn is None:
+            from googlesearch import search as search_fn
+        self.search = search_fn
+        # Papers are held in memory, so cap the size of any single download
+        self.max_download_bytes = int(max_download_mb * 1024 * 1024)
 
     def find_papers(self, subject_name, university="", num_results=3):
         """
         Searches for question papers for the given subject.
-        Returns a list of local paths to downloaded PDFs.
+        Returns a list of in-memory PDFs (io.BytesIO, with .name set to the file name).
         """
+        import requests
+
         # Improved query with filetype:pdf
         if university:
             query = f"{university} {subject_name} question paper filetype:pdf post 2020"
@@ -24,15 +31,9 @@ class WebScraper:
         try:
             # Search for PDFs
             urls = []
-            # Increase num_results to scan more candidates
-            for url in search(query, num_results=15, advanced=True):
-                # advanced=True returns SearchResult objects, but basic returns strings
-                # Let's stick to basic for now, but handle the iterator carefully
-                pass 
-            
-            # Re-implementing loop to be safer with the generator
+            # Scan more candidates than we need; many results aren't direct PDFs
             count = 0
-            for url in search(query, num_results=20):
+            for url in self.search(query, num_results=20):
                 if url.lower().endswith('.pdf'):
                     urls.append(url)
                     count += 1
@@ -43,7 +44,7 @@ class WebScraper:
                 print("No direct PDF links found. Trying broader search...")
                 # Fallback: Try without filetype:pdf but look for 'pdf' in url
                 query_fallback = f"{subject_name} previous year question paper pdf"
-                for url in search(query_fallback, num_results=15):
+                for url in self.search(query_fallback, num_results=15):
                     if url.lower().endswith('.pdf'):
                         urls.append(url)
                         if len(urls) >= num_results:
@@ -61,16 +62,18 @@ class WebScraper:
                     print(f"Downloading {url}...")
                     # User-Agent is often required to avoid 403 Forbidden
                     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-                    response = requests.get(url, headers=headers, timeout=15)
-                    
-                    if response.status_code == 200 and 'application/pdf' in response.headers.get('Content-Type', ''):
-                        # Save to temp file
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                            tmp.write(response.content)
-                            downloaded_files.append(tmp.name)
-                            print(f"Successfully downloaded: {tmp.name}")
-                    else:
-                        print(f"Skipping {url}: Not a valid PDF (Status: {response.status_code}, Type: {response.headers.get('Content-Type')})")
+                    with requests.get(url, headers=headers, timeout=15, stream=True) as response:
+                        if response.status_code == 200 and 'application/pdf' in response.headers.get('Content-Type', ''):
+                            content = self._read_limited(response)
+                            if content is None:
+                                print(f"Skipping {url}: larger than {self.max_download_bytes // (1024 * 1024)} MB")
+                                continue
+                            pdf = io.BytesIO(content)
+                            pdf.name = os.path.basename(unquote(urlparse(url).path)) or f"paper_{i+1}.pdf"
+                            downloaded_files.append(pdf)
+                            print(f"Successfully downloaded: {pdf.name}")
+                        else:
+                            print(f"Skipping {url}: Not a valid PDF (Status: {response.status_code}, Type: {response.headers.get('Content-Type')})")
                         
                 except Exception as e:
                     print(f"Failed to download {url}: {e}")
@@ -81,10 +84,23 @@ class WebScraper:
             
         return downloaded_files
 
-    def find_study_material(self, topic, num_results=2):
+    def _read_limited(self, response):
+        """
+        Reads a streamed response body, giving up (None) once it exceeds the size cap.
+        """
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer.extend(chunk)
+            if len(buffer) > self.max_download_bytes:
+                return None
+        return bytes(buffer)
+
+    def find_study_material(self, topic, num_results=2, raise_errors=False):
         """
         Searches for study material/tutorials for a specific topic.
         Returns a list of tuples: (Title, URL)
+        With raise_errors=True a failed search raises instead of returning [],
+        so callers (e.g. StudyMaterialCache) can tell it apart from "no results".
         """
         # Targeted search for tutorials
         query = f"{topic} tutorial geeksforgeeks javatpoint tutorialspoint"
@@ -92,13 +108,15 @@ class WebScraper:
         
         resources = []
         try:
-            for url in search(query, num_results=num_results):
+            for url in self.search(query, num_results=num_results):
                 # Simple heuristic to get a readable title from URL
                 # e.g. https://www.geeksforgeeks.org/compiler-design-tutorials/ -> Compiler Design Tutorials
                 domain = url.split('//')[-1].split('/')[0].replace('www.', '')
                 resources.append((f"Tutorial ({domain})", url))
                 
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Resource search failed for {topic}: {e}")
             
         return resources
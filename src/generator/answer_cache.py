@@ -0,0 +1,98 @@
+import threading
+import numpy as np
+
+class AnswerCache:
+    """
+    Nearest-neighbour cache of generated answers.
+    Questions are embedded with the same sentence encoder as SemanticModeler, and a
+    new question reuses a stored answer when its cosine similarity to a cached
+    question (same subject and marks) is at least `threshold`.
+    """
+    def __init__(self, encoder, threshold=0.9, max_entries_per_bucket=5000):
+        # encoder: anything with encode(list_of_str) -> array, e.g. SemanticModeler().model
+        self.encoder = encoder
+        self.threshold = threshold
+        self.max_entries_per_bucket = max_entries_per_bucket
+        self._buckets = {}  # (subject, marks) -> {'embeddings': ndarray, 'questions': [], 'answers': []}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, subject, marks):
+        return (" ".join(str(subject).lower().split()), int(marks))
+
+    def _embed(self, question):
+        vec = np.asarray(self.encoder.encode([question]), dtype=np.float32)[0]
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def lookup(self, question, subject, marks=10):
+        """
+        Returns (answer, similarity) for the closest cached question, or (None, best_similarity).
+        """
+        answer, similarity, _ = self._lookup(question, subject, marks)
+        return answer, similarity
+
+    def _lookup(self, question, subject, marks):
+        embedding = self._embed(question)
+        with self._lock:
+            bucket = self._buckets.get(self._key(subject, marks))
+            if bucket is None or not bucket['answers']:
+                self.misses += 1
+                return None, 0.0, embedding
+
+            # Rows are unit vectors, so the dot product is the cosine similarity
+            sims = bucket['embeddings'] @ embedding
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                self.hits += 1
+                return bucket['answers'][best], float(sims[best]), embedding
+
+            self.misses += 1
+            return None, float(sims[best]), embedding
+
+    def store(self, question, subject, answer, marks=10, embedding=None):
+        if embedding is None:
+            embedding = self._embed(question)
+        with self._lock:
+            bucket = self._buckets.setdefault(self._key(subject, marks), {
+                'embeddings': np.zeros((0, len(embedding)), dtype=np.float32),
+                'questions': [],
+                'answers': [],
+            })
+            if len(bucket['answers']) >= self.max_entries_per_bucket:
+                # Drop the oldest entry
+                bucket['embeddings'] = bucket['embeddings'][1:]
+                bucket['questions'].pop(0)
+                bucket['answers'].pop(0)
+            bucket['embeddings'] = np.vstack([bucket['embeddings'], embedding[None, :]])
+            bucket['questions'].append(question)
+            bucket['answers'].append(answer)
+
+    def get_or_generate(self, question, subject, marks, generate):
+        """
+        Returns a cached answer if one is close enough, otherwise calls
+        generate() and caches its result. generate() signals failure by
+        raising; the exception propagates and nothing is cached.
+        """
+        answer, _, embedding = self._lookup(question, subject, marks)
+        if answer is not None:
+            return answer
+
+        answer = generate()
+        if answer:
+            self.store(question, subject, answer, marks, embedding=embedding)
+        return answer
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(b['answers']) for b in self._buckets.values())
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self),
+        }
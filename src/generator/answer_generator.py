@@ -1,32 +1,53 @@
-import google.generativeai as genai
 import os
+from types import SimpleNamespace
+
+class OfflineModel:
+    """
+    Local stand-in for a Gemini model, for offline tests and demos.
+    Returns a canned answer and counts how often it was called.
+    """
+    def __init__(self, answer="Offline model answer."):
+        self.answer = answer
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(text=self.answer)
 
 class AnswerGenerator:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache=None, model=None):
         self.api_key = api_key
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
+        # Optional AnswerCache shared across sessions
+        self.cache = cache
+        # Explicit model object (e.g. OfflineModel); otherwise a Gemini model name
+        self.model = model
+        self.model_name = None
+        self.client = None
+        if self.model is None and self.api_key:
+            # Each generator gets its own client bound to its key, so sessions
+            # with different keys never share (or wait on) global SDK state.
+            # Imported here so offline use (OfflineModel) doesn't need the SDK.
+            from google import genai
+            self.client = genai.Client(api_key=self.api_key)
+            available_models = [m.name for m in self.client.models.list() if 'generateContent' in (m.supported_actions or [])]
             
             # Priority list of models to try
             preferred_models = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro']
-            self.model = None
-            
-            available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
             
             # Try to find a preferred model first
             for preferred in preferred_models:
                 # Check if any available model contains the preferred string (e.g. 'models/gemini-1.5-flash-001')
                 match = next((m for m in available_models if preferred in m), None)
                 if match:
-                    self.model = genai.GenerativeModel(match)
+                    self.model_name = match
                     print(f"Selected preferred model: {match}")
                     break
             
             # Fallback: pick the first available 'gemini' model if no preferred one found
-            if not self.model:
+            if not self.model_name:
                 for m in available_models:
                     if 'gemini' in m:
-                        self.model = genai.GenerativeModel(m)
+                        self.model_name = m
                         print(f"Fallback model: {m}")
                         break
 
@@ -34,9 +55,20 @@ class AnswerGenerator:
         """
         Generates a model answer for a given question.
         """
-        if not self.model:
+        if not self.model and not self.model_name:
             return "Error: API Key not configured."
 
+        try:
+            if self.cache is not None:
+                return self.cache.get_or_generate(question, subject, marks, lambda: self._generate(question, subject, marks))
+            return self._generate(question, subject, marks)
+        except Exception as e:
+            return f"Error generating answer: {str(e)}"
+
+    def _generate(self, question, subject, marks):
+        """
+        Calls the model. Raises on failure so failed answers are never cached.
+        """
         prompt = f"""
         You are an expert academic professor in {subject}.
         Please write a model answer for the following exam question.
@@ -51,8 +83,8 @@ class AnswerGenerator:
         - Keep the tone academic and precise.
         """
         
-        try:
+        if self.model is not None:
             response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating answer: {str(e)}"
+        else:
+            response = self.client.models.generate_content(model=self.model_name, contents=prompt)
+        return response.text
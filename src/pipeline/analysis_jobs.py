@@ -0,0 +1,235 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from src.processor.pdf_loader import PDFLoader
+from src.processor.syllabus_parser import SyllabusParser
+from src.processor.question_extractor import QuestionExtractor
+from src.analyzer.semantic_modeler import SemanticModeler
+from src.analyzer.question_store import QuestionStore
+from src.predictor.predictor import Predictor
+from src.collector.web_scraper import WebScraper
+
+class AnalysisJob:
+    """
+    State of one Analyze & Predict run. Written to disk as job.json so a
+    reconnecting browser can pick up the result.
+    """
+    def __init__(self, job_id, options):
+        self.job_id = job_id
+        self.options = options
+        self.state = "queued"  # queued -> running -> done | failed
+        self.progress = 0.0
+        self.message = "Waiting for a free worker..."
+        self.log = []
+        self.error = None
+        self.created = time.time()
+        self.syllabus_topics = []
+        self.paper_names = []
+        self.study_plan = None
+
+    def update(self, progress, message):
+        self.progress = progress
+        self.message = message
+        self.log.append(message)
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'options': self.options,
+            'state': self.state,
+            'progress': self.progress,
+            'message': self.message,
+            'log': list(self.log),
+            'error': self.error,
+            'created': self.created,
+            'syllabus_topics': self.syllabus_topics,
+            'paper_names': self.paper_names,
+            'study_plan': self.study_plan,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data['job_id'], data.get('options', {}))
+        for field in ('state', 'progress', 'message', 'log', 'error', 'created', 'syllabus_topics', 'paper_names', 'study_plan'):
+            if field in data:
+                setattr(job, field, data[field])
+        return job
+
+
+class JobManager:
+    """
+    Runs analyses on a bounded worker pool and persists their results.
+    max_workers caps how many heavy (OCR/embedding) jobs run at once on this server;
+    further jobs wait in the queue. Results older than retention_hours are deleted.
+    """
+    def __init__(self, max_workers=2, results_dir=None, retention_hours=24):
+        self.results_dir = results_dir or os.path.join(tempfile.gettempdir(), "study_smart_jobs")
+        self.retention = retention_hours * 3600
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._cleanup()
+
+    def submit(self, options, syllabus, papers=None):
+        """
+        Queues an analysis and returns its job id.
+        syllabus / papers are in-memory files (see PDFLoader.extract_text);
+        papers=None fetches them from the web using options['subject_name'].
+        """
+        self._cleanup()
+        job = AnalysisJob(uuid.uuid4().hex, options)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._persist(job)
+        self._executor.submit(self._run, job, syllabus, papers)
+        return job.job_id
+
+    def get(self, job_id):
+        """
+        Returns the job from memory, or from disk after a restart/reconnect. None if unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        path = self._job_file(job_id)
+        if not path:
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                job = AnalysisJob.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            # Missing (never existed or cleaned up meanwhile) or unreadable
+            if not isinstance(e, FileNotFoundError):
+                print(f"Could not load analysis job {job_id}: {e}")
+            return None
+        if job.state in ("queued", "running"):
+            # The process that ran it is gone
+            job.state = "failed"
+            job.error = "The server restarted before this analysis finished. Please run it again."
+        return job
+
+    def load_questions(self, job_id):
+        path = self._store_file(job_id)
+        if not path:
+            return None
+        try:
+            return QuestionStore.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Could not load questions for analysis job {job_id}: {e}")
+            return None
+
+    def _job_dir(self, job_id):
+        # Job ids come from the URL, so only accept the hex ids we generate
+        if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        return os.path.join(self.results_dir, job_id)
+
+    def _job_file(self, job_id):
+        job_dir = self._job_dir(job_id)
+        return os.path.join(job_dir, "job.json") if job_dir else None
+
+    def _store_file(self, job_id):
+        job_dir = self._job_dir(job_id)
+        return os.path.join(job_dir, "questions.npz") if job_dir else None
+
+    def _persist(self, job):
+        job_dir = self._job_dir(job.job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        tmp_path = os.path.join(job_dir, "job.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f)
+        os.replace(tmp_path, self._job_file(job.job_id))
+
+    def _cleanup(self):
+        cutoff = time.time() - self.retention
+        for name in os.listdir(self.results_dir):
+            path = os.path.join(self.results_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    with self._lock:
+                        self._jobs.pop(name, None)
+            except OSError:
+                pass
+
+    def _report(self, job, progress, message):
+        job.update(progress, message)
+        self._persist(job)
+
+    def _fail(self, job, error):
+        job.state = "failed"
+        job.error = error
+        self._report(job, job.progress, error)
+
+    def _run(self, job, syllabus, papers):
+        options = job.options
+        job.state = "running"
+        try:
+            self._report(job, 0.0, "Initializing modules...")
+            loader = PDFLoader(
+                tesseract_cmd=options.get('tesseract_path') or None,
+                ocr_dpi=options.get('ocr_dpi', 200),
+                ocr_lang=options.get('ocr_lang', 'eng'),
+                ocr_psm=options.get('ocr_psm', 3),
+            )
+            syllabus_parser = SyllabusParser(loader=loader)
+            extractor = QuestionExtractor()
+            modeler = SemanticModeler(n_topics=5)
+            predictor = Predictor()
+
+            # 1. Process Syllabus
+            self._report(job, 0.05, "Processing syllabus...")
+            job.syllabus_topics = syllabus_parser.parse_syllabus(syllabus)
+            self._report(job, 0.1, f"Extracted {len(job.syllabus_topics)} topics from syllabus.")
+
+            # 2. Acquire Papers
+            if papers is None:
+                self._report(job, 0.1, "Searching and downloading papers...")
+                papers = WebScraper().find_papers(options.get('subject_name', ''), options.get('university_name', ''))
+                if not papers:
+                    self._fail(job, "No papers found online. Please upload manually.")
+                    return
+                self._report(job, 0.2, f"Downloaded {len(papers)} papers.")
+            job.paper_names = [p.name for p in papers]
+
+            # 3. Process Papers
+            store = QuestionStore()
+            for i, paper in enumerate(papers):
+                raw_text = loader.extract_text(paper)
+                kept = 0
+                if raw_text:
+                    questions = extractor.extract_questions(raw_text)
+                    kept = modeler.filter_into_store(store, paper.name, questions, job.syllabus_topics)
+                self._report(job, 0.2 + 0.75 * (i + 1) / len(papers), f"Paper {i+1}/{len(papers)} ({paper.name}): {kept} questions matched the syllabus.")
+
+            if not store.paper_names:
+                self._fail(job, "No valid data processed.")
+                return
+
+            # 4. Generate Study Plan
+            job.study_plan = predictor.generate_study_plan(store)
+            store.save(self._store_file(job.job_id))
+            job.state = "done"
+            self._report(job, 1.0, "Analysis complete.")
+        except Exception as e:
+            print(f"Analysis job {job.job_id} failed: {e}")
+            self._fail(job, f"Analysis failed: {e}")
+
+
+def copy_upload(uploaded_file):
+    """
+    Copies a Streamlit upload into a standalone named BytesIO that outlives the script run.
+    """
+    data = io.BytesIO(uploaded_file.getvalue())
+    data.name = uploaded_file.name
+    return data
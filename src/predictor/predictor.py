@@ -1,5 +1,6 @@
 import random
-from collections import Counter
+import numpy as np
+from src.analyzer.question_store import QuestionStore
 
 class Predictor:
     def __init__(self):
@@ -8,43 +9,43 @@ class Predictor:
     def generate_study_plan(self, processed_data):
         """
         Generates a study plan based on topic frequency.
-        processed_data: list of dicts, where each dict has 'questions' list.
-                        Each item in 'questions' is {'question': q, 'topic': t}
+        processed_data: a QuestionStore, or (legacy) a list of dicts where each
+                        dict has a 'questions' list of {'question': q, 'topic': t}
         """
-        # 1. Aggregate Topic Counts
-        topic_counts = Counter()
-        topic_questions = {} # Store questions for each topic to show examples
-        
-        for paper in processed_data:
-            for item in paper['questions']:
-                topic = item['topic']
-                topic_counts[topic] += 1
-                
-                if topic not in topic_questions:
-                    topic_questions[topic] = []
-                topic_questions[topic].append(item['question'])
+        store = processed_data if isinstance(processed_data, QuestionStore) else QuestionStore.from_records(processed_data)
+
+        # 1. Aggregate Topic Counts (vectorized group-by)
+        topic_counts = store.topic_counts()
+        order, starts = store.group_by_topic()
 
         # 2. Rank Topics
-        total_questions = sum(topic_counts.values())
+        total_questions = int(topic_counts.sum())
+        if total_questions == 0:
+            return []
+
+        weightages = topic_counts * 100.0 / total_questions
+        priorities = np.select([weightages >= 15, weightages >= 5], ["High", "Medium"], default="Low")
+
+        # Most frequent first; stable so ties keep first-seen order (topic ids are
+        # assigned in order of first appearance)
+        ranked_ids = np.argsort(-topic_counts, kind='stable')
         ranked_topics = []
         
-        for topic, count in topic_counts.most_common():
-            weightage = (count / total_questions) * 100 if total_questions > 0 else 0
-            
-            # Determine Priority
-            if weightage >= 15:
-                priority = "High"
-            elif weightage >= 5:
-                priority = "Medium"
-            else:
-                priority = "Low"
+        for topic_id in ranked_ids.tolist():
+            count = int(topic_counts[topic_id])
+            if count == 0:
+                break
+
+            # Only the sampled example rows are decoded back to text
+            rows = order[starts[topic_id]:starts[topic_id + 1]]
+            sample = random.sample(range(count), min(3, count))
                 
             ranked_topics.append({
-                'topic': topic,
+                'topic': store.topics[topic_id],
                 'count': count,
-                'weightage': round(weightage, 1),
-                'priority': priority,
-                'example_questions': random.sample(topic_questions[topic], min(3, len(topic_questions[topic])))
+                'weightage': round(float(weightages[topic_id]), 1),
+                'priority': str(priorities[topic_id]),
+                'example_questions': [store.question(int(rows[j])) for j in sample]
             })
             
         return ranked_topics
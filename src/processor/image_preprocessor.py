@@ -0,0 +1,101 @@
+from PIL import Image, ImageOps
+import numpy as np
+
+class ImagePreprocessor:
+    def __init__(self, max_side=2000, grayscale=True, binarize=True, deskew=True, max_skew_angle=5.0, skew_step=0.5):
+        # Phone photos are often 4000px+ on the long side, which Tesseract
+        # handles slowly and no more accurately than ~2000px. Only applied to
+        # photos; rendered PDF pages are already sized by the chosen DPI.
+        self.max_side = max_side
+        self.grayscale = grayscale
+        self.binarize = binarize
+        self.deskew = deskew
+        self.max_skew_angle = max_skew_angle
+        self.skew_step = skew_step
+
+    def process(self, image, downscale=True):
+        """
+        Prepares a PIL image for OCR.
+        Applies (in order): EXIF orientation, downscaling, grayscale, deskew, binarization.
+        Pass downscale=False for rendered PDF pages so the render DPI is kept.
+        """
+        # Respect camera orientation before anything else
+        image = ImageOps.exif_transpose(image)
+        if downscale:
+            image = self._downscale(image)
+
+        if self.grayscale or self.binarize or self.deskew:
+            image = image.convert('L')
+
+        if self.deskew:
+            angle = self.estimate_skew(image)
+            if abs(angle) >= self.skew_step:
+                # Fill the exposed corners with white so they don't read as ink
+                image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+
+        if self.binarize:
+            threshold = self._otsu_threshold(image)
+            image = image.point(lambda p: 255 if p > threshold else 0)
+
+        return image
+
+    def _downscale(self, image):
+        if not self.max_side:
+            return image
+
+        width, height = image.size
+        longest = max(width, height)
+        if longest <= self.max_side:
+            return image
+
+        scale = self.max_side / longest
+        return image.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+
+    def _otsu_threshold(self, image):
+        """
+        Picks the gray level that best separates ink from paper (Otsu's method).
+        """
+        hist = np.asarray(image.histogram()[:256], dtype=np.float64)
+        total = hist.sum()
+        if total == 0:
+            return 127
+
+        levels = np.arange(256)
+        weight_bg = np.cumsum(hist)
+        weight_fg = total - weight_bg
+        cum_mean = np.cumsum(hist * levels)
+        mean_total = cum_mean[-1]
+
+        # Between-class variance for every candidate threshold
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_bg = cum_mean / weight_bg
+            mean_fg = (mean_total - cum_mean) / weight_fg
+            between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+
+        between = np.nan_to_num(between)
+        return int(between.argmax())
+
+    def estimate_skew(self, image):
+        """
+        Estimates page skew in degrees using a projection profile.
+        Text lines produce sharp peaks in the row sums when the page is level,
+        so the angle with the highest row-sum variance wins.
+        """
+        # Work on a small thumbnail; the angle does not depend on resolution
+        thumb = image.convert('L')
+        thumb.thumbnail((800, 800))
+        ink = np.asarray(thumb) < self._otsu_threshold(thumb)
+        if not ink.any():
+            return 0.0
+
+        ink_image = Image.fromarray((ink * 255).astype(np.uint8))
+        best_angle = 0.0
+        best_score = -1.0
+        for angle in np.arange(-self.max_skew_angle, self.max_skew_angle + self.skew_step, self.skew_step):
+            rotated = np.asarray(ink_image.rotate(float(angle), resample=Image.NEAREST, fillcolor=0))
+            score = rotated.sum(axis=1, dtype=np.float64).var()
+            if score > best_score:
+                best_score = score
+                best_angle = float(angle)
+
+        return best_angle
@@ -0,0 +1,104 @@
+import PyPDF2
+
+# Optional faster backends; used automatically when installed
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+class PDFTextBackend:
+    """
+    Base class for text-layer extraction backends.
+    Subclasses implement extract_pages(stream) -> list of page strings.
+    """
+    name = "base"
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def extract_pages(self, stream):
+        raise NotImplementedError
+
+    def extract_text(self, stream):
+        text = ""
+        for page_text in self.extract_pages(stream):
+            if page_text:
+                text += page_text + "\n"
+        return text
+
+    def _read_bytes(self, stream):
+        if hasattr(stream, 'getvalue'):
+            return stream.getvalue()
+        stream.seek(0)
+        return stream.read()
+
+
+class PyPDF2Backend(PDFTextBackend):
+    name = "pypdf2"
+
+    def extract_pages(self, stream):
+        reader = PyPDF2.PdfReader(stream)
+        return [page.extract_text() or "" for page in reader.pages]
+
+
+class PyMuPDFBackend(PDFTextBackend):
+    name = "pymupdf"
+
+    @classmethod
+    def is_available(cls):
+        return fitz is not None
+
+    def extract_pages(self, stream):
+        with fitz.open(stream=self._read_bytes(stream), filetype="pdf") as doc:
+            return [page.get_text() for page in doc]
+
+
+class PdfiumBackend(PDFTextBackend):
+    name = "pdfium"
+
+    @classmethod
+    def is_available(cls):
+        return pdfium is not None
+
+    def extract_pages(self, stream):
+        pdf = pdfium.PdfDocument(self._read_bytes(stream))
+        pages = []
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        return pages
+
+
+# Fastest first; PyPDF2 is always installed and is the final fallback
+BACKENDS = [PyMuPDFBackend, PdfiumBackend, PyPDF2Backend]
+
+
+def available_backends():
+    return [backend.name for backend in BACKENDS if backend.is_available()]
+
+
+def get_backend(name=None):
+    """
+    Returns a backend instance by name, or the fastest available one if name is None.
+    """
+    for backend in BACKENDS:
+        if name is not None and backend.name != name:
+            continue
+        if backend.is_available():
+            return backend()
+        if name is not None:
+            raise ValueError(f"PDF backend '{name}' is not installed. Installed: {available_backends()}")
+
+    raise ValueError(f"Unknown PDF backend '{name}'. Choose from: {[b.name for b in BACKENDS]}")
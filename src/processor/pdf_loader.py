@@ -1,12 +1,26 @@
-import PyPDF2
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, convert_from_bytes
 import pytesseract
 from PIL import Image
 import os
+import io
 import shutil
+from .image_preprocessor import ImagePreprocessor
+from .pdf_backends import get_backend
 
 class PDFLoader:
-    def __init__(self, tesseract_cmd=None):
+    def __init__(self, tesseract_cmd=None, ocr_dpi=200, ocr_lang='eng', ocr_psm=3, preprocessor=None, pdf_backend=None):
+        # Text-layer backend: a name from pdf_backends ('pymupdf', 'pdfium', 'pypdf2')
+        # or None to pick the fastest one installed
+        self.pdf_backend = get_backend(pdf_backend)
+
+        # OCR settings: render resolution for scanned pages, Tesseract language(s)
+        # (e.g. 'eng+hin') and page segmentation mode (3 = auto, 6 = single block, 4 = columns)
+        self.ocr_dpi = ocr_dpi
+        # An empty language makes Tesseract fail on every page, so fall back to English
+        self.ocr_lang = (ocr_lang or '').strip() or 'eng'
+        self.ocr_psm = ocr_psm
+        self.preprocessor = preprocessor if preprocessor is not None else ImagePreprocessor()
+
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
         else:
@@ -23,61 +37,123 @@ class PDFLoader:
                     pytesseract.pytesseract.tesseract_cmd = path
                     break
 
-    def extract_text(self, file_path):
+    def extract_text(self, source, filename=None):
         """
         Extracts text from a file (PDF or Image).
+        source can be a path, bytes/bytearray/memoryview, or a file-like object
+        such as a Streamlit upload. In-memory sources are never written to disk.
+        filename is an optional hint used to detect the type of in-memory data.
         """
-        ext = os.path.splitext(file_path)[1].lower()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+
+        kind = self._detect_kind(source, filename)
         
-        if ext in ['.jpg', '.jpeg', '.png']:
-            return self._extract_text_from_image(file_path)
-        elif ext == '.pdf':
-            return self._extract_text_from_pdf(file_path)
+        if kind == 'image':
+            return self._extract_text_from_image(source)
+        elif kind == 'pdf':
+            return self._extract_text_from_pdf(source)
         else:
             return ""
 
-    def _extract_text_from_image(self, file_path):
+    def _detect_kind(self, source, filename=None):
+        """
+        Returns 'pdf', 'image' or None, from the file extension if there is one,
+        otherwise from the leading magic bytes.
+        """
+        name = filename or (source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None))
+        if isinstance(name, (str, os.PathLike)):
+            ext = os.path.splitext(os.fspath(name))[1].lower()
+            if ext in ['.jpg', '.jpeg', '.png']:
+                return 'image'
+            elif ext == '.pdf':
+                return 'pdf'
+
+        if isinstance(source, (str, os.PathLike)):
+            return None
+
+        pos = source.tell()
+        header = source.read(8)
+        source.seek(pos)
+
+        if header.startswith(b'%PDF'):
+            return 'pdf'
+        if header.startswith(b'\x89PNG') or header.startswith(b'\xff\xd8'):
+            return 'image'
+        return None
+
+    def _describe(self, source):
+        # Readable label for log messages
+        if isinstance(source, (str, os.PathLike)):
+            return os.fspath(source)
+        return getattr(source, 'name', None) or "<in-memory file>"
+
+    def _extract_text_from_image(self, source):
         try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-            return text
+            if not isinstance(source, (str, os.PathLike)):
+                source.seek(0)
+            image = Image.open(source)
+            return self._ocr_image(image, is_photo=True)
         except Exception as e:
-            print(f"Error reading image {file_path}: {e}")
+            print(f"Error reading image {self._describe(source)}: {e}")
             return ""
 
-    def _extract_text_from_pdf(self, file_path):
+    def _extract_text_from_pdf(self, source):
         text = ""
         try:
-            with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            if isinstance(source, (str, os.PathLike)):
+                with open(source, 'rb') as f:
+                    text = self._extract_text_layer(f)
+            else:
+                source.seek(0)
+                text = self._extract_text_layer(source)
             
             # Fallback to OCR if text is sparse
             if len(text.strip()) < 50:
-                print(f"Text extraction yielded low content for {file_path}. Attempting OCR...")
-                text = self._extract_text_ocr(file_path)
+                print(f"Text extraction yielded low content for {self._describe(source)}. Attempting OCR...")
+                text = self._extract_text_ocr(source)
                 
         except Exception as e:
-            print(f"Error reading PDF {file_path}: {e}")
+            print(f"Error reading PDF {self._describe(source)}: {e}")
             return None
             
         return text
 
-    def _extract_text_ocr(self, file_path):
+    def _extract_text_layer(self, stream):
+        return self.pdf_backend.extract_text(stream)
+
+    def _extract_text_ocr(self, source):
         """
         Fallback method using OCR for PDFs.
         """
         text = ""
         try:
-            images = convert_from_path(file_path)
+            # Render straight to grayscale; colour adds nothing for OCR
+            if isinstance(source, (str, os.PathLike)):
+                images = convert_from_path(source, dpi=self.ocr_dpi, grayscale=True)
+            else:
+                images = convert_from_bytes(self._read_all(source), dpi=self.ocr_dpi, grayscale=True)
             for i, image in enumerate(images):
-                page_text = pytesseract.image_to_string(image)
+                page_text = self._ocr_image(image)
                 text += page_text + "\n"
         except Exception as e:
-            print(f"OCR failed for {file_path}: {e}")
+            print(f"OCR failed for {self._describe(source)}: {e}")
             return ""
         
         return text
+
+    def _read_all(self, stream):
+        if hasattr(stream, 'getvalue'):
+            # BytesIO (and Streamlit uploads)
+            return stream.getvalue()
+        stream.seek(0)
+        return stream.read()
+
+    def _ocr_image(self, image, is_photo=False):
+        """
+        Runs Tesseract on a single image after preprocessing.
+        Only photos are downscaled; rendered pages keep the ocr_dpi resolution.
+        """
+        if self.preprocessor:
+            image = self.preprocessor.process(image, downscale=is_photo)
+        return pytesseract.image_to_string(image, lang=self.ocr_lang, config=f"--psm {self.ocr_psm}")
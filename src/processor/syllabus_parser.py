@@ -2,16 +2,19 @@ from .pdf_loader import PDFLoader
 import re
 
 class SyllabusParser:
-    def __init__(self):
-        self.loader = PDFLoader()
+    def __init__(self, loader=None):
+        # Share the caller's loader so the syllabus is OCR'd with the same
+        # language/layout/DPI settings as the papers
+        self.loader = loader if loader is not None else PDFLoader()
 
-    def parse_syllabus(self, file_path):
+    def parse_syllabus(self, source):
         """
         Parses the syllabus PDF and extracts a list of topics.
+        source can be a path or an in-memory file (see PDFLoader.extract_text).
         This is a simplified implementation. A real one would need
         complex NLP to distinguish 'topics' from 'instructions'.
         """
-        raw_text = self.loader.extract_text(file_path)
+        raw_text = self.loader.extract_text(source)
         if not raw_text:
             return []
 
@@ -0,0 +1,80 @@
+import numpy as np
+
+from src.generator.answer_cache import AnswerCache
+from src.generator.answer_generator import AnswerGenerator, OfflineModel
+
+
+class KeywordEncoder:
+    """
+    Stub sentence encoder: bag of a few keywords, so paraphrases that share
+    the keywords embed identically and nothing needs downloading.
+    """
+    keywords = ["lr", "parsing", "table", "dfa", "minimize", "hamming", "code"]
+
+    def encode(self, sentences):
+        vectors = []
+        for sentence in sentences:
+            words = sentence.lower().replace("?", " ").replace(".", " ").split()
+            vectors.append([float(k in words) for k in self.keywords] + [0.1])
+        return np.array(vectors)
+
+
+def make_generator(answer="Offline model answer."):
+    model = OfflineModel(answer)
+    cache = AnswerCache(KeywordEncoder(), threshold=0.9)
+    return AnswerGenerator(cache=cache, model=model), model, cache
+
+
+def test_paraphrase_hits_cache():
+    generator, model, cache = make_generator()
+
+    first = generator.generate_answer("Explain LR parsing table construction.", "Compiler Design")
+    second = generator.generate_answer("Construct the parsing table for LR", "compiler  design")
+
+    assert first == second == "Offline model answer."
+    assert model.calls == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_different_question_misses():
+    generator, model, _ = make_generator()
+
+    generator.generate_answer("Explain LR parsing table construction.", "Compiler Design")
+    generator.generate_answer("Minimize the given DFA.", "Compiler Design")
+
+    assert model.calls == 2
+
+
+def test_subject_and_marks_are_separate_buckets():
+    generator, model, cache = make_generator()
+    question = "Explain LR parsing table construction."
+
+    generator.generate_answer(question, "Compiler Design", marks=10)
+    generator.generate_answer(question, "Compiler Design", marks=5)
+    generator.generate_answer(question, "Theory of Computation", marks=10)
+
+    assert model.calls == 3
+    assert cache.stats() == {'hits': 0, 'misses': 3, 'hit_rate': 0.0, 'entries': 3}
+
+
+def test_answers_starting_with_error_are_cached():
+    generator, model, _ = make_generator("Error-detecting codes add redundancy such as parity bits.")
+
+    generator.generate_answer("Explain Hamming code.", "Computer Networks")
+    generator.generate_answer("Explain the Hamming code", "Computer Networks")
+
+    assert model.calls == 1
+
+
+def test_failures_are_not_cached():
+    generator, model, cache = make_generator()
+
+    def fail(prompt):
+        model.calls += 1
+        raise RuntimeError("quota exceeded")
+
+    model.generate_content = fail
+    answer = generator.generate_answer("Explain LR parsing table construction.", "Compiler Design")
+
+    assert answer.startswith("Error generating answer")
+    assert len(cache) == 0
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from src.collector.material_prefetcher import StudyMaterialCache
+from src.collector.web_scraper import WebScraper
+
+
+class StubSearch:
+    """
+    Local stand-in for Google search: returns one URL per query, optionally
+    slowly or failing, and counts calls.
+    """
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query, num_results=10):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("HTTP Error 429: Too Many Requests")
+        return [f"https://www.example.org/{query.split()[0].lower()}"]
+
+
+def make_cache(search, **kwargs):
+    return StudyMaterialCache(WebScraper(search_fn=search), **kwargs)
+
+
+def test_repeat_lookups_hit_cache_until_ttl():
+    search = StubSearch()
+    cache = make_cache(search, ttl=0.2)
+
+    first = cache.get("Parsing")
+    second = cache.get("  parsing ")
+
+    assert first == second == [("Tutorial (example.org)", "https://www.example.org/parsing")]
+    assert search.calls == 1
+    assert cache.stats()['hits'] == 1
+
+    time.sleep(0.3)
+    cache.get("Parsing")
+    assert search.calls == 2
+
+
+def test_concurrent_requests_share_one_search():
+    search = StubSearch(delay=0.2)
+    cache = make_cache(search)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get("DFA"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert search.calls == 1
+    assert len(results) == 5 and all(r == results[0] for r in results)
+
+
+def test_click_does_not_wait_for_prefetch_backlog():
+    search = StubSearch(delay=0.2)
+    cache = make_cache(search)
+    cache.prefetch([f"Topic{i}" for i in range(10)])
+
+    start = time.monotonic()
+    links = cache.get("Topic9")
+
+    assert links
+    assert time.monotonic() - start < 1.0
+
+
+def test_failures_are_not_cached_and_back_off_prefetch():
+    search = StubSearch(fail=True)
+    cache = make_cache(search, failure_backoff=60)
+
+    assert cache.get("Hashing") is None
+    assert search.calls == 1
+
+    # Prefetch respects the backoff...
+    cache.prefetch(["Hashing"])
+    time.sleep(0.1)
+    assert search.calls == 1
+
+    # ...but an explicit click retries, and a success is then cached
+    search.fail = False
+    assert cache.get("Hashing")
+    assert cache.get("Hashing")
+    assert search.calls == 2